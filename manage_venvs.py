@@ -10,40 +10,375 @@ import subprocess
 import json
 import shutil
 import logging
+import logging.handlers
+import re
+import shlex
+import importlib
+import platform
 import psutil
 import threading
 import time
-import signal
 import queue
+import atexit
+import signal
+import itertools
+from collections import deque
+import selectors
+import hashlib
+import filecmp
+import tarfile
+import tempfile
+import urllib.parse
+import urllib.request
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 import yaml
 
-# Setup logging
+try:
+    import zstandard
+except ImportError:  # Snapshots fall back to uncompressed tarballs
+    zstandard = None
+
+try:
+    import orjson
+except ImportError:  # JSON config files fall back to the json module
+    orjson = None
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
+
+# Setup logging; records are only queued on the calling thread, a background
+# listener formats and writes them to the console and log file
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('venv_manager.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('venv_manager.log')
-    ]
+    format='%(message)s',  # The listener's handlers add time and level
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Drains the queue before exit
 logger = logging.getLogger(__name__)
 
+# Google Drive mount point on Colab; caches kept here survive runtime restarts
+COLAB_DRIVE_DIR = Path('/content/drive/MyDrive')
+
+# pax header recording the path a venv snapshot was taken from
+SNAPSHOT_ORIGIN_HEADER = 'WEBUI.venv_path'
+# ... and the base interpreter the venv links to, which may not outlive the runtime
+SNAPSHOT_BASE_HEADER = 'WEBUI.base_python'
+
+# Launched tool logs are flushed to disk at most this often (seconds)
+LOG_FLUSH_INTERVAL = 0.1
+
+# Lowercase phrases in launched tool output that mark it as up, or as failing
+_RUNNING_PHRASES = ('running on', 'server started', 'listening on', 'model loaded')
+_ERROR_PHRASES = ('error', 'failed', 'exception', 'traceback')
+
+# RAM-backed filesystem venvs can optionally live on for the session
+TMPFS_DIR = Path('/dev/shm')
+
+# Parallel HTTP range requests used when prefetching large wheels
+PREFETCH_SEGMENTS = 8
+PREFETCH_MIN_SPLIT_BYTES = 64 * 1024 * 1024
+
+# pip options uv does not accept; uv already behaves this way
+_UV_IMPLIED_PIP_FLAGS = ('--use-pep517',)
+
+
+class SetupError(Exception):
+    """A tool setup stage failed"""
+    
+    def __init__(self, tool_id: str, stage: str, returncode: Optional[int] = None):
+        self.tool_id = tool_id
+        self.stage = stage
+        self.returncode = returncode
+        detail = f" (exit code {returncode})" if returncode is not None else ""
+        super().__init__(f"{tool_id} setup failed at: {stage}{detail}")
+
+# Long-lived pip worker run inside a target venv: imports pip once and then
+# services JSON-encoded pip commands from stdin. pip's own output is moved to
+# stderr so the stdout pipe only carries one status line per request.
+_PIP_DRIVER_SOURCE = '''
+import json, os, sys
+from pip._internal.cli.main import main as pip_main
+import pip._internal.commands.install
+replies = os.fdopen(os.dup(1), 'w')
+os.dup2(2, 1)
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    try:
+        status = pip_main(json.loads(line)['args'])
+    except SystemExit as e:
+        status = e.code
+    replies.write(json.dumps({'returncode': status or 0}) + '\\n')
+    replies.flush()
+'''
+
+
+# Commands that only exist inside a shell, or change its state for later commands
+_SHELL_BUILTINS = frozenset({
+    'cd', 'source', '.', 'export', 'unset', 'set', 'alias', 'eval', 'exec',
+    'pushd', 'popd', 'ulimit', 'umask', 'trap', 'shopt'
+})
+
+
+def _command_argv(command: str) -> Optional[List[str]]:
+    """Split a command string into argv, or None if it needs a shell"""
+    # Newlines separate commands and '#' starts a comment in a shell
+    if '\n' in command:
+        return None
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ''
+    tokens = list(lexer)
+    for token in tokens:
+        if set(token) <= set(lexer.punctuation_chars) or any(c in token for c in '$`*?'):
+            return None
+        if token.startswith('#'):
+            return None
+        # Tilde expansion (but not version specifiers like 'pkg~=1.0')
+        if token.startswith('~') or '=~' in token or ':~' in token:
+            return None
+    argv = shlex.split(command)
+    # Builtins and 'VAR=value cmd' prefixes mean nothing to exec
+    if not argv or argv[0] in _SHELL_BUILTINS or '=' in argv[0]:
+        return None
+    return argv
+
+
+def _split_command_chain(command: str) -> List[str]:
+    """Split a command line at its unquoted '&&' operators"""
+    parts = []
+    start = i = 0
+    quote = None
+    while i < len(command):
+        char = command[i]
+        if quote:
+            if char == quote:
+                quote = None
+            elif char == '\\' and quote == '"':
+                i += 1
+        elif char in '\'"':
+            quote = char
+        elif char == '\\':
+            i += 1
+        elif command.startswith('&&', i):
+            parts.append(command[start:i])
+            start = i + 2
+            i += 1
+        i += 1
+    parts.append(command[start:])
+    return parts
+
+
+def _install_steps(install_cmd) -> Optional[List[List[str]]]:
+    """argv templates of each install step, or None if install_cmd needs a shell
+
+    install_cmd is a command string (simple commands may be chained with &&),
+    a single argv list, or a list of argv lists that run in order. A chain
+    with any step that needs a shell (e.g. 'cd sub && ...') runs as a whole
+    in one shell, since later steps may depend on its state.
+    """
+    if isinstance(install_cmd, str):
+        try:
+            steps = [_command_argv(segment) for segment in _split_command_chain(install_cmd)]
+        except ValueError:  # Unbalanced quotes once split - leave it to the shell
+            return None
+        return steps if all(steps) else None
+    if install_cmd and isinstance(install_cmd[0], str):
+        return [list(install_cmd)]
+    return [list(step) for step in install_cmd]
+
+
+def _install_cmd_text(install_cmd) -> str:
+    """install_cmd as a single command line, for logs and hashing"""
+    if isinstance(install_cmd, str):
+        return install_cmd
+    return ' && '.join(shlex.join(step) for step in _install_steps(install_cmd))
+
+
+def _is_network_fs(path: Path) -> bool:
+    """Whether path lives on a network or FUSE mount (NFS, SMB, Google Drive)"""
+    path = os.path.realpath(path)
+    best_mount, best_type = '', ''
+    try:
+        with open('/proc/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace('\\040', ' ')
+                if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) \
+                        and len(mount_point) > len(best_mount):
+                    best_mount, best_type = mount_point, fields[2]
+    except OSError:
+        return False
+    return best_type.startswith(('nfs', 'cifs', 'smb', 'fuse', '9p'))
+
+
+def _version_matches(version: str, full_version: str) -> bool:
+    """Whether a configured version (e.g. 3.10) covers a full one (e.g. 3.10.12)"""
+    wanted = version.split('.')
+    return full_version.split('.')[:len(wanted)] == wanted
+
 class EnhancedMultiVenvManager:
     """Enhanced manager for multiple isolated virtual environments"""
     
     def __init__(self, config_path: str = "config.json"):
         self.config_path = Path(config_path)
         self.load_config()
-        self.workspace_dir = Path(self.config['workspace_settings']['workspace_dir'])
-        self.models_dir = Path(self.config['workspace_settings']['models_dir'])
+        # tool_id -> bytes claimed on tmpfs by setups that are still installing
+        self._tmpfs_reserved: Dict[str, int] = {}
+        self._tmpfs_lock = threading.Lock()
+        self._uv_exe: Optional[str] = None
+        self._uv_lock = threading.Lock()
+        self._python_exe_cache: Dict[str, str] = {}
+        self._python_exe_lock = threading.Lock()
+        # git/pip children of in-flight setups -> the cancel event of the
+        # prepare stage that started them (None outside one), so a failed
+        # batch or prepare stage can stop them
+        self._children: Dict[subprocess.Popen, Optional[threading.Event]] = {}
+        self._children_lock = threading.Lock()
+        self._setup_cancelled = threading.Event()
+        self._thread_state = threading.local()
+        # Tools whose venv was created (and so freshly installed) this batch
+        self._new_venvs: set = set()
         self.processes: Dict[str, Dict[str, Any]] = {}
-        self.log_queues: Dict[str, queue.Queue] = {}
+        self.log_queues: Dict[str, deque] = {}
         self.monitoring_active = False
+        # One thread multiplexes the output pipes of every launched tool
+        self._output_selector = selectors.DefaultSelector()
+        self._output_thread: Optional[threading.Thread] = None
+        self._output_lock = threading.Lock()
         self.setup_base_structure()
         
+    def _resolve_cache_dir(self) -> Path:
+        """Pick the directory holding pip caches, venv snapshots and pre-staged wheels"""
+        configured = self.config['workspace_settings'].get('cache_dir')
+        if configured:
+            return Path(configured)
+        if COLAB_DRIVE_DIR.is_dir():
+            return COLAB_DRIVE_DIR / '.webui_cache'
+        return self.workspace_dir / '.cache'
+        
+    def _resolve_uv_cache_dir(self) -> Path:
+        """uv cache location; kept off network/FUSE mounts so installs can hard-link from it"""
+        configured = self.config['workspace_settings'].get('uv_cache_dir')
+        if configured:
+            return Path(configured)
+        if _is_network_fs(self.cache_dir):
+            return Path(tempfile.gettempdir()) / 'uv_cache'
+        return self.cache_dir / 'uv'
+        
+    def _build_config_state(self):
+        """Derive the lookup tables and prebuilt commands from the loaded config"""
+        # Read-only views of the config sections looked up throughout
+        self._tools = MappingProxyType(self.config['tools'])
+        self._categories = MappingProxyType(self.config['model_categories'])
+        self._category_names = tuple(self._categories)
+        self.workspace_dir = Path(self.config['workspace_settings']['workspace_dir'])
+        self.models_dir = Path(self.config['workspace_settings']['models_dir'])
+        self.cache_dir = self._resolve_cache_dir()
+        self.installer = self.config['workspace_settings'].get('installer', 'uv')
+        # Snapshots pay off where the runtime (and its venvs) is thrown away
+        self.venv_snapshots = self.config['workspace_settings'].get(
+            'venv_snapshots', COLAB_DRIVE_DIR.is_dir()
+        )
+        self.uv_cache_dir = self._resolve_uv_cache_dir()
+        self.venv_cache_dir = Path(self.config['workspace_settings'].get(
+            'venv_cache_dir', self.cache_dir / 'snapshots'
+        ))
+        # Installing into RAM avoids slow small-file writes; off by default
+        # since the venvs are lost on reboot
+        self.venv_tmpfs = self.config['workspace_settings'].get('venv_tmpfs', False)
+        self._model_extensions = {
+            category: frozenset(ext.lower() for ext in info['extensions'])
+            for category, info in self._categories.items()
+        }
+        # category -> (dir mtime_ns, model count, total bytes) from the last scan
+        self._model_scan_cache: Dict[str, Tuple[int, int, int]] = {}
+        self._precompile_commands()
+        self._prebuild_launch_commands()
+        
+    def _precompile_commands(self):
+        """Build each tool's setup argv once instead of on every setup"""
+        self._commands: Dict[str, Dict[str, Any]] = {}
+        for tool_id, tool_config in self._tools.items():
+            tool_dir = self.workspace_dir / tool_config['dir']
+            staging_dir = tool_dir.with_name(f".{tool_dir.name}.clone")
+            venv_dir = tool_dir / tool_config['venv_name']
+            sparse_paths = tool_config.get('sparse_checkout')
+            self._commands[tool_id] = {
+                'staging_dir': staging_dir,
+                # Shallow, single-branch, blob-less clone over protocol v2:
+                # only the blobs of the checked-out tip are ever transferred
+                'clone': [
+                    "git", "-c", "protocol.version=2", "clone",
+                    "--depth", "1", "--single-branch", "--no-tags", "--filter=blob:none",
+                    *(["--sparse"] if sparse_paths else []),
+                    tool_config['repo'], str(staging_dir)
+                ],
+                # Cone-mode sparse checkout: top-level files plus only the
+                # listed directories are materialized (and their blobs fetched)
+                'sparse_checkout': [
+                    "git", "-C", str(staging_dir), "sparse-checkout", "set", "--cone", *sparse_paths
+                ] if sparse_paths else None,
+                # uv links a seeded venv in well under a second. --seed still
+                # provides pip, which WebUI launchers use to install extras.
+                'uv_venv': [
+                    "venv", "--seed", "--quiet",
+                    "--python", tool_config['python_version'], str(venv_dir)
+                ],
+                # argv templates (one per step) with {pip}/{python}
+                # placeholders, or None when install_cmd needs a shell
+                'install': _install_steps(tool_config['install_cmd'])
+            }
+        
+    def _prebuild_launch_commands(self):
+        """Build every tool's launch argv, once per hardware profile, up front"""
+        # (tool_id, hardware_profile or None) -> argv without custom args
+        self._prebuilt_cmds: Dict[Tuple[str, Optional[str]], Tuple[str, ...]] = {}
+        models_dir = str(self.models_dir)
+        profiles = {None: [], **{
+            name: profile['args'] for name, profile in self.config.get('hardware_profiles', {}).items()
+        }}
+        for tool_id, tool_config in self._tools.items():
+            venv_dir = self.workspace_dir / tool_config['dir'] / tool_config['venv_name']
+            if os.name == 'nt':  # Windows
+                python_exe = venv_dir / "Scripts/python.exe"
+            else:  # Unix/Linux
+                python_exe = venv_dir / "bin/python"
+            
+            # Centralized model arguments (for CLI method)
+            central_args = []
+            if tool_config.get('centralization_method') == 'cli_args':
+                central_args = [
+                    arg.format(models_dir=models_dir)
+                    for arg in tool_config.get('centralization_args', [])
+                ]
+            
+            for profile, profile_args in profiles.items():
+                self._prebuilt_cmds[(tool_id, profile)] = (
+                    str(python_exe), tool_config['script'],
+                    *tool_config.get('default_args', []),
+                    *profile_args,
+                    *central_args
+                )
+        
     def load_config(self):
         """Load configuration from JSON file"""
         try:
@@ -55,31 +390,49 @@ class EnhancedMultiVenvManager:
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in config file: {e}")
             raise
+        # Everything cached from the previous config is stale now
+        self._build_config_state()
     
     def setup_base_structure(self):
         """Create base directory structure"""
         directories = [
             self.workspace_dir,
             self.workspace_dir / 'logs',
+            self.cache_dir / 'pip',
+            self.uv_cache_dir,
+            self.cache_dir / 'wheels',
+            self.venv_cache_dir,
             self.models_dir
         ]
         
         # Create model subdirectories
-        for category in self.config['model_categories'].keys():
+        for category in self._category_names:
             directories.append(self.models_dir / category)
         
+        # Parents come first in the list, so after the first run each
+        # directory costs one mkdir call instead of a walk up its parents
         for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:  # Parent not created yet, e.g. a fresh cache_dir
+                directory.mkdir(parents=True, exist_ok=True)
             
         logger.info(f"Base structure created at {self.workspace_dir}")
         self._create_model_readmes()
     
     def _create_model_readmes(self):
         """Create README files in model directories"""
-        for category, info in self.config['model_categories'].items():
+        for category, info in self._categories.items():
             readme_path = self.models_dir / category / "README.txt"
-            if not readme_path.exists():
-                content = f"""
+            # Exclusive create: existing READMEs are skipped without a separate stat
+            try:
+                readme = open(readme_path, 'x')
+            except FileExistsError:
+                continue
+            with readme:
+                readme.write(f"""
 {category} Models Directory
 {'=' * (len(category) + 16)}
 
@@ -90,11 +443,23 @@ Estimated size per model: ~{info['size_estimate_gb']} GB
 
 This directory is shared across all compatible WebUIs to prevent duplication.
 Place your {category.lower()} files here to make them available to all tools.
-"""
-                readme_path.write_text(content)
+""")
     
     def get_python_executable(self, version: str) -> str:
         """Get Python executable for specific version"""
+        # Tools sharing a Python version would otherwise re-probe the same
+        # candidates; the lock keeps concurrent setups from probing twice
+        with self._python_exe_lock:
+            if version not in self._python_exe_cache:
+                self._python_exe_cache[version] = self._find_python_executable(version)
+            return self._python_exe_cache[version]
+    
+    def _find_python_executable(self, version: str) -> str:
+        """Probe PATH for an interpreter reporting the given version"""
+        # The interpreter running us needs no probing at all
+        if _version_matches(version, platform.python_version()):
+            return sys.executable
+        
         executables = [
             f"python{version}",
             f"python{version[:3]}", 
@@ -103,52 +468,344 @@ Place your {category.lower()} files here to make them available to all tools.
         ]
         
         for exe in executables:
-            if shutil.which(exe):
+            # Check the usual system location before walking all of PATH
+            system_exe = f"/usr/bin/{exe}"
+            exe_path = system_exe if os.path.exists(system_exe) else shutil.which(exe)
+            if exe_path:
                 try:
                     result = subprocess.run(
-                        [exe, "--version"], 
+                        [exe_path, "--version"], 
+                        stdin=subprocess.DEVNULL,
                         capture_output=True, 
-                        text=True,
                         timeout=10
                     )
                     ### FIXED ###: Change from exact match `in` to `startswith` for flexibility
-                    if result.stdout.strip().startswith(f"Python {version}"):
-                        return exe
+                    if result.stdout.decode('ascii', 'ignore').strip().startswith(f"Python {version}"):
+                        return exe_path
                 except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
                     continue
         
         raise RuntimeError(f"Python {version} not found. Please install it first.")
     
+    def _subprocess_env(self) -> Dict[str, str]:
+        """Environment for git/pip child processes"""
+        env = os.environ.copy()
+        # Non-interactive pip without per-run version checks or root warnings
+        env.setdefault('PIP_NO_INPUT', '1')
+        env.setdefault('PIP_DISABLE_PIP_VERSION_CHECK', '1')
+        env.setdefault('PIP_ROOT_USER_ACTION', 'ignore')
+        # One wheel cache for every venv so tools reuse each other's downloads
+        env.setdefault('PIP_CACHE_DIR', str(self.cache_dir / 'pip'))
+        env.setdefault('UV_CACHE_DIR', str(self.uv_cache_dir))
+        # Wheels staged here are installed without hitting the network
+        wheels_dir = str(self.cache_dir / 'wheels')
+        env.setdefault('PIP_FIND_LINKS', wheels_dir)
+        env.setdefault('UV_FIND_LINKS', wheels_dir)
+        # Match pip's index resolution when extra indexes (e.g. PyTorch) are used
+        env.setdefault('UV_INDEX_STRATEGY', 'unsafe-best-match')
+        # Unpack wheels into the venv with one worker per core; disk writes
+        # dominate installs on Colab's networked storage
+        install_workers = str(self.config['workspace_settings'].get('install_workers', os.cpu_count() or 4))
+        env.setdefault('UV_CONCURRENT_INSTALLS', install_workers)
+        # Hard-link installed files from the shared cache instead of copying
+        # them, so a torch/CUDA install is stored once on disk across venvs
+        env.setdefault('UV_LINK_MODE', 'hardlink')
+        return env
+    
+    def _run_command(self, cmd, cwd: Optional[Path] = None, timeout: Optional[int] = None,
+                     env: Optional[Dict[str, str]] = None, quiet: bool = False):
+        """Run a git/pip child process, raising CalledProcessError on failure
+
+        argv lists are exec'd directly; only plain strings go through a shell.
+        Output goes straight to our stdout without passing through Python;
+        quiet discards stdout entirely (errors on stderr are still shown).
+        With an absolute argv[0], no cwd and inherited fds left alone, CPython
+        starts the child with posix_spawn instead of forking the (possibly
+        multi-GB Jupyter) parent; our own fds are non-inheritable anyway.
+        """
+        env = env or self._subprocess_env()
+        if not isinstance(cmd, str):
+            executable = shutil.which(cmd[0], path=env.get('PATH'))
+            if executable:
+                cmd = [os.path.abspath(executable), *cmd[1:]]
+        
+        process = subprocess.Popen(
+            cmd,
+            shell=isinstance(cmd, str),
+            cwd=str(cwd) if cwd else None,
+            stdout=subprocess.DEVNULL if quiet else None,
+            close_fds=False,
+            env=env
+        )
+        self._track_child(process)
+        try:
+            returncode = process.wait(timeout=timeout)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            self._untrack_child(process)
+        
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd)
+    
+    def _is_cancelled(self, step_cancelled: Optional[threading.Event] = None) -> bool:
+        """Whether the batch, or the prepare stage running this step, was cancelled"""
+        if step_cancelled is None:
+            step_cancelled = getattr(self._thread_state, 'cancelled', None)
+        return self._setup_cancelled.is_set() or bool(step_cancelled and step_cancelled.is_set())
+    
+    def _track_child(self, process: subprocess.Popen):
+        """Register a setup child process so a cancelled batch can stop it"""
+        with self._children_lock:
+            self._children[process] = getattr(self._thread_state, 'cancelled', None)
+        if self._is_cancelled():
+            process.terminate()
+    
+    def _untrack_child(self, process: subprocess.Popen, returncode: Optional[int] = None):
+        """Forget a finished child, remembering its exit code for SetupError"""
+        with self._children_lock:
+            self._children.pop(process, None)
+        self._thread_state.returncode = process.returncode if returncode is None else returncode
+    
+    def _terminate_children(self, cancelled: Optional[threading.Event] = None):
+        """Stop every git/pip child of in-flight setups, or only those of one prepare stage"""
+        with self._children_lock:
+            children = [process for process, owner in self._children.items()
+                        if cancelled is None or owner is cancelled]
+        for process in children:
+            if process.poll() is None:
+                process.terminate()
+    
+    def _run_pip_batch(self, python_exe: Path, requests: List[List[str]], cwd: Optional[Path] = None,
+                       timeout: Optional[int] = None, env: Optional[Dict[str, str]] = None):
+        """Run several pip commands through one pip process inside a venv"""
+        process = subprocess.Popen(
+            [str(python_exe), '-u', '-c', _PIP_DRIVER_SOURCE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            cwd=str(cwd) if cwd else None,
+            env=env or self._subprocess_env()
+        )
+        self._track_child(process)
+        watchdog = threading.Timer(timeout, process.kill) if timeout else None
+        if watchdog:
+            watchdog.start()
+        returncode = None
+        try:
+            for args in requests:
+                process.stdin.write(json.dumps({'args': args}) + '\n')
+                process.stdin.flush()
+                reply = process.stdout.readline()
+                if not reply:
+                    if watchdog and not watchdog.is_alive():
+                        raise subprocess.TimeoutExpired(['pip'] + args, timeout)
+                    raise subprocess.CalledProcessError(process.wait(), ['pip'] + args)
+                returncode = json.loads(reply)['returncode']
+                if returncode:
+                    raise subprocess.CalledProcessError(returncode, ['pip'] + args)
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            process.stdin.close()
+            process.wait()
+            self._untrack_child(process, returncode)
+    
+    def prefetch_wheels(self, urls: List[str], dest: Optional[Path] = None) -> List[Path]:
+        """Download wheels into the shared find-links directory in parallel
+
+        Large files are split into PREFETCH_SEGMENTS HTTP range requests so a
+        multi-GB torch wheel isn't limited to a single connection. pip and uv
+        then pick the wheels up from the find-links dir instead of the index.
+        """
+        dest = dest or self.cache_dir / 'wheels'
+        dest.mkdir(parents=True, exist_ok=True)
+        
+        targets = {}
+        hashes = {}
+        for url in urls:
+            location, _, fragment = url.partition('#')
+            filename = urllib.parse.unquote(location.rsplit('/', 1)[-1])
+            wheel_path = dest / filename
+            # Index URLs carry the expected digest, e.g. '#sha256=...'
+            algorithm, _, digest = fragment.partition('=')
+            if digest and algorithm in hashlib.algorithms_guaranteed:
+                hashes[url] = (algorithm, digest.lower())
+            if wheel_path.exists():
+                logger.info(f"Wheel already staged: {filename}")
+            else:
+                targets[url] = wheel_path
+        
+        if not targets:
+            return []
+        
+        # Segment threads don't see our thread state; hand them the cancel event
+        step_cancelled = getattr(self._thread_state, 'cancelled', None)
+        with ThreadPoolExecutor(max_workers=PREFETCH_SEGMENTS) as executor:
+            sizes = dict(zip(targets, executor.map(self._probe_download, targets)))
+            
+            segment_futures = {}
+            for url, wheel_path in targets.items():
+                part_path = wheel_path.with_name(wheel_path.name + '.part')
+                size = sizes[url]
+                if size is None:
+                    # Server doesn't support ranges - fetch in one request
+                    ranges = [None]
+                else:
+                    with open(part_path, 'wb') as f:
+                        f.truncate(size)
+                    count = PREFETCH_SEGMENTS if size >= PREFETCH_MIN_SPLIT_BYTES else 1
+                    step = -(-size // count)
+                    ranges = [(start, min(start + step, size) - 1)
+                              for start in range(0, size, step)]
+                segment_futures[url] = [
+                    executor.submit(self._download_range, url, part_path, byte_range, step_cancelled)
+                    for byte_range in ranges
+                ]
+            
+            fetched = []
+            for url, futures in segment_futures.items():
+                wheel_path = targets[url]
+                part_path = wheel_path.with_name(wheel_path.name + '.part')
+                try:
+                    for future in futures:
+                        future.result()
+                    if url in hashes:
+                        self._verify_download(part_path, *hashes[url])
+                    os.replace(part_path, wheel_path)
+                    fetched.append(wheel_path)
+                    logger.info(f"✅ Prefetched {wheel_path.name}")
+                except Exception as e:
+                    logger.warning(f"Failed to prefetch {url}: {e}")
+                    part_path.unlink(missing_ok=True)
+        
+        return fetched
+    
+    def _probe_download(self, url: str) -> Optional[int]:
+        """Return the download size if the server accepts range requests"""
+        try:
+            request = urllib.request.Request(url, method='HEAD')
+            with urllib.request.urlopen(request, timeout=30) as response:
+                if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+                    return None
+                # An empty or missing length can't be split into ranges
+                return int(response.headers['Content-Length']) or None
+        except (OSError, KeyError, ValueError):
+            return None
+    
+    @staticmethod
+    def _verify_download(path: Path, algorithm: str, expected: str):
+        """Raise ValueError unless a downloaded file matches its expected digest"""
+        digest = hashlib.new(algorithm)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        if digest.hexdigest() != expected:
+            raise ValueError(f"{algorithm} digest mismatch")
+    
+    def _download_range(self, url: str, part_path: Path, byte_range: Optional[Tuple[int, int]],
+                        step_cancelled: Optional[threading.Event] = None):
+        """Fetch one byte range of url into its offset in part_path"""
+        request = urllib.request.Request(url)
+        if byte_range is None:
+            mode, offset = 'wb', 0
+        else:
+            mode, offset = 'r+b', byte_range[0]
+            request.add_header('Range', f"bytes={byte_range[0]}-{byte_range[1]}")
+        
+        with urllib.request.urlopen(request, timeout=60) as response, \
+                open(part_path, mode) as f:
+            if byte_range is not None and response.status != 206:
+                raise OSError(f"Server ignored range request for {url}")
+            f.seek(offset)
+            # Copy in blocks so a cancelled setup stops multi-GB downloads
+            for block in iter(lambda: response.read(1024 * 1024), b''):
+                if self._is_cancelled(step_cancelled):
+                    raise OSError("setup cancelled")
+                f.write(block)
+    
+    def _prefetch_tool_wheels(self, tool_id: str) -> bool:
+        """Stage a tool's prefetch_wheels; failures fall back to the index"""
+        urls = self._tools[tool_id].get('prefetch_wheels', [])
+        try:
+            self.prefetch_wheels(urls)
+        except Exception as e:
+            logger.warning(f"Wheel prefetch failed for {tool_id}: {e}")
+        return True
+    
+    def _ensure_uv(self) -> Optional[str]:
+        """Locate uv, installing it into the launcher environment if needed"""
+        if self.installer != 'uv':
+            return None
+        
+        with self._uv_lock:
+            if self._uv_exe:
+                return self._uv_exe
+            
+            uv_exe = shutil.which('uv')
+            if not uv_exe:
+                try:
+                    logger.info("Installing uv into the launcher environment...")
+                    self._run_command([
+                        sys.executable, "-m", "pip", "install", "uv"
+                    ], timeout=300, quiet=True)
+                    importlib.invalidate_caches()
+                    import uv
+                    uv_exe = uv.find_uv_bin()
+                except Exception as e:
+                    logger.warning(f"uv unavailable, falling back to pip (serial wheel installs): {e}")
+                    self.installer = 'pip'
+                    return None
+            
+            self._uv_exe = uv_exe
+            return uv_exe
+    
     def clone_repository(self, tool_id: str) -> bool:
         """Clone repository for specific tool"""
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         tool_dir = self.workspace_dir / tool_config['dir']
         
-        if tool_dir.exists():
+        if (tool_dir / '.git').exists():
             logger.info(f"Repository for {tool_config['name']} already exists")
             return True
         
+        # Clone beside tool_dir and move the checkout in afterwards, so the
+        # venv can be created inside tool_dir while the clone is running
+        staging_dir = self._commands[tool_id]['staging_dir']
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        
         try:
             logger.info(f"Cloning {tool_config['name']} repository...")
-            cmd = [
-                "git", "clone", "--depth", "1", 
-                tool_config['repo'], str(tool_dir)
-            ]
+            env = self._subprocess_env()
+            env['GIT_LFS_SKIP_SMUDGE'] = '1'  # Don't pull LFS sample assets
+            # Abort a stalled transfer after a minute instead of the full timeout
+            env.setdefault('GIT_HTTP_LOW_SPEED_LIMIT', '1000')
+            env.setdefault('GIT_HTTP_LOW_SPEED_TIME', '60')
+            self._run_command(self._commands[tool_id]['clone'], timeout=300, env=env)
+            if self._commands[tool_id]['sparse_checkout']:
+                self._run_command(self._commands[tool_id]['sparse_checkout'], timeout=300, env=env)
+            
+            tool_dir.mkdir(parents=True, exist_ok=True)
+            for entry in staging_dir.iterdir():
+                os.replace(entry, tool_dir / entry.name)
+            staging_dir.rmdir()
             
-            subprocess.run(cmd, check=True, timeout=300)
             logger.info(f"✅ Repository cloned for {tool_config['name']}")
             return True
             
         except subprocess.TimeoutExpired:
             logger.error(f"❌ Timeout cloning repository for {tool_config['name']}")
             return False
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             logger.error(f"❌ Failed to clone repository for {tool_config['name']}: {e}")
             return False
     
     def create_virtual_environment(self, tool_id: str) -> bool:
         """Create virtual environment for specific tool"""
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         tool_dir = self.workspace_dir / tool_config['dir']
         venv_dir = tool_dir / tool_config['venv_name']
         
@@ -157,39 +814,83 @@ Place your {category.lower()} files here to make them available to all tools.
             return True
         
         try:
+            self._prepare_venv_location(tool_id)
+            uv_exe = self._ensure_uv()
+            if uv_exe:
+                logger.info(f"Creating venv for {tool_config['name']} with uv "
+                            f"(Python {tool_config['python_version']})")
+                self._run_command(
+                    [uv_exe] + self._commands[tool_id]['uv_venv'],
+                    timeout=300, quiet=True
+                )
+                
+                logger.info(f"✅ Virtual environment created for {tool_config['name']}")
+                self._new_venvs.add(tool_id)
+                return True
+            
+            # venv seeds pip via ensurepip and, with --upgrade-deps, updates it
+            # in the same step - no separate ensurepip/upgrade runs needed
             python_exe = self.get_python_executable(tool_config['python_version'])
             logger.info(f"Creating venv for {tool_config['name']} using {python_exe}")
-            
-            # Create virtual environment
-            subprocess.run([
-                python_exe, "-m", "venv", str(venv_dir)
-            ], check=True, timeout=120)
-            
-            ### FIXED ###: Ensure pip exists to prevent exit code 127
-            logger.info("Ensuring pip is available in the new venv...")
-            subprocess.run([
-                str(python_exe), "-m", "ensurepip", "--upgrade"
-            ], check=True, timeout=120)
-            
-            # Upgrade pip using the venv's python
-            venv_python_exe = venv_dir / "bin" / "python"
-            subprocess.run([
-                str(venv_python_exe), "-m", "pip", "install", "--upgrade", "pip", "setuptools", "wheel"
-            ], check=True, timeout=300)
+            # venv refuses a symlinked target (venv_tmpfs), so build at the
+            # real location and point the scripts back at venv_dir, as uv does
+            target_dir = venv_dir.resolve()
+            self._run_command([
+                python_exe, "-m", "venv", "--upgrade-deps", str(target_dir)
+            ], timeout=300, quiet=True)
+            if target_dir != venv_dir:
+                self._relocate_venv(venv_dir, str(target_dir))
             
             logger.info(f"✅ Virtual environment created for {tool_config['name']}")
+            self._new_venvs.add(tool_id)
             return True
             
         except Exception as e:
             logger.error(f"❌ Failed to create venv for {tool_config['name']}: {e}")
+            # Don't leave a half-built venv that later runs take as existing
+            shutil.rmtree(venv_dir.resolve(), ignore_errors=True)
+            if venv_dir.is_symlink():
+                venv_dir.unlink()
             return False
     
+    def _prepare_venv_location(self, tool_id: str):
+        """Clear a stale venv symlink and, with venv_tmpfs, point the venv at RAM"""
+        tool_config = self._tools[tool_id]
+        venv_dir = self.workspace_dir / tool_config['dir'] / tool_config['venv_name']
+        
+        # A tmpfs venv from a previous boot leaves a dangling link behind
+        if venv_dir.is_symlink() and not venv_dir.exists():
+            venv_dir.unlink()
+        
+        if not self.venv_tmpfs or not TMPFS_DIR.is_dir():
+            return
+        
+        # An installed WebUI venv takes up to ~6GB; keep headroom for the tools.
+        # Concurrent setups all check before any of them installs, so space
+        # claimed by the others is held back until their setup finishes.
+        required = self.config['workspace_settings'].get('venv_tmpfs_reserve_gb', 8) * 1024**3
+        with self._tmpfs_lock:
+            reserved = sum(self._tmpfs_reserved.values())
+            if (psutil.virtual_memory().available - reserved < required
+                    or shutil.disk_usage(TMPFS_DIR).free - reserved < required):
+                logger.info(f"Not enough free RAM to place {tool_config['name']} venv on tmpfs")
+                return
+            self._tmpfs_reserved[tool_id] = required
+        
+        tmpfs_venv = TMPFS_DIR / 'webui_venvs' / tool_id / tool_config['venv_name']
+        if tmpfs_venv.exists():
+            shutil.rmtree(tmpfs_venv)
+        tmpfs_venv.mkdir(parents=True)
+        venv_dir.parent.mkdir(parents=True, exist_ok=True)
+        venv_dir.symlink_to(tmpfs_venv, target_is_directory=True)
+        logger.info(f"Placing {tool_config['name']} venv on tmpfs at {tmpfs_venv}")
+    
     # ... The rest of the file (install_dependencies, launch_tool, etc.) remains the same ...
     # (The following code is the same as before, no changes needed)
     
     def install_dependencies(self, tool_id: str) -> bool:
         """Install dependencies for specific tool"""
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         tool_dir = self.workspace_dir / tool_config['dir']
         venv_dir = tool_dir / tool_config['venv_name']
         
@@ -200,24 +901,51 @@ Place your {category.lower()} files here to make them available to all tools.
             pip_exe = venv_dir / "bin/pip"
             python_exe = venv_dir / "bin/python"
         
+        env = self._subprocess_env()
+        uv_exe = self._ensure_uv()
+        if uv_exe:
+            # uv installs into the venv named by VIRTUAL_ENV, resolving and
+            # downloading in parallel instead of pip's one-at-a-time fetches
+            pip_argv = [uv_exe, "pip"]
+            env['VIRTUAL_ENV'] = str(venv_dir)
+        else:
+            pip_argv = [str(pip_exe)]
+        
         try:
-            # Execute install command
-            install_cmd = tool_config['install_cmd'].format(
-                pip=str(pip_exe),
-                python=str(python_exe)
-            )
+            steps = self._commands[tool_id]['install']
+            pip_batch = None
+            if steps is None:
+                # Commands using shell features still need a shell
+                install_cmds = [tool_config['install_cmd'].format(
+                    pip=' '.join(shlex.quote(arg) for arg in pip_argv),
+                    python=shlex.quote(str(python_exe))
+                )]
+                if tool_config.get('post_install'):
+                    logger.warning(f"post_install is ignored for shell install_cmd of {tool_id}")
+                command_str = install_cmds[0]
+            else:
+                install_cmds = self._render_install_steps(tool_id, steps, pip_argv, python_exe, bool(uv_exe))
+                if not uv_exe and len(install_cmds) > 1 and all(
+                    step[0] == '{pip}' and '{pip}' not in step[1:] for step in steps
+                ):
+                    # A chain of plain pip calls shares one pip process
+                    pip_batch = [cmd[len(pip_argv):] for cmd in install_cmds]
+                command_str = ' && '.join(shlex.join(cmd) for cmd in install_cmds)
             
             logger.info(f"Installing dependencies for {tool_config['name']}")
-            logger.info(f"Command: {install_cmd}")
+            logger.info(f"Command: {command_str}")
             
             # Run in tool directory
-            subprocess.run(
-                install_cmd,
-                shell=True,
-                cwd=str(tool_dir),
-                check=True,
-                timeout=1800  # 30 minutes max
-            )
+            if pip_batch:
+                self._run_pip_batch(python_exe, pip_batch, cwd=tool_dir, timeout=1800, env=env)
+            else:
+                for install_cmd in install_cmds:
+                    self._run_command(
+                        install_cmd,
+                        cwd=tool_dir,
+                        timeout=1800,  # 30 minutes max
+                        env=env
+                    )
             
             logger.info(f"✅ Dependencies installed for {tool_config['name']}")
             return True
@@ -225,13 +953,255 @@ Place your {category.lower()} files here to make them available to all tools.
         except subprocess.TimeoutExpired:
             logger.error(f"❌ Timeout installing dependencies for {tool_config['name']}")
             return False
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             logger.error(f"❌ Failed to install dependencies for {tool_config['name']}: {e}")
             return False
+
+    def _render_install_steps(self, tool_id: str, steps: List[List[str]], pip_argv: List[str],
+                              python_exe: Path, use_uv: bool) -> List[List[str]]:
+        """Expand install step templates into the argv lists to run"""
+        tool_config = self._tools[tool_id]
+        overrides = tool_config.get('post_install', [])
+        pip_installs = [i for i, step in enumerate(steps) if step[:2] == ['{pip}', 'install']]
+        if overrides and not pip_installs:
+            logger.warning(f"post_install is ignored for install_cmd of {tool_id} without a pip install")
+        
+        install_cmds = []
+        for i, step in enumerate(steps):
+            install_cmd = []
+            for arg in step:
+                if arg == '{pip}':
+                    install_cmd.extend(pip_argv)
+                else:
+                    install_cmd.append(arg.format(pip=' '.join(pip_argv), python=str(python_exe)))
+            if step[0] == '{pip}' and use_uv:
+                install_cmd = [arg for arg in install_cmd if arg not in _UV_IMPLIED_PIP_FLAGS]
+            install_cmds.append(install_cmd)
+            
+            # Pins go on the last pip install so nothing after undoes them
+            if overrides and pip_installs and i == pip_installs[-1]:
+                if use_uv:
+                    # uv resolves the pins in the same pass, overriding any
+                    # other requirement on those packages
+                    install_cmds[-1] = install_cmd + [
+                        *overrides, '--override', str(self._write_overrides(tool_id, overrides))
+                    ]
+                else:
+                    # pip has no overrides; force the pins in a second pass
+                    install_cmds.append([*pip_argv, 'install', '--force-reinstall', *overrides])
+        return install_cmds
+    
+    def _write_overrides(self, tool_id: str, overrides: List[str]) -> Path:
+        """Write a tool's post_install pins as a uv overrides file"""
+        overrides_path = self.cache_dir / 'overrides' / f"{tool_id}.txt"
+        overrides_path.parent.mkdir(parents=True, exist_ok=True)
+        overrides_path.write_text('\n'.join(overrides) + '\n')
+        return overrides_path
+    
+    def _venv_signature(self, tool_id: str) -> str:
+        """Hash of everything that determines the contents of a tool's venv"""
+        tool_config = self._tools[tool_id]
+        tool_dir = self.workspace_dir / tool_config['dir']
+        digest = hashlib.sha256()
+        
+        # Paths baked into the venv are rewritten on restore, so only the
+        # venv's directory name (the archive root) is part of the key
+        install_cmd = _install_cmd_text(tool_config['install_cmd'])
+        for part in (tool_config['python_version'], install_cmd,
+                     *tool_config.get('post_install', []), tool_config['venv_name']):
+            digest.update(part.encode() + b'\0')
+        
+        for reqs_file in re.findall(r'(?:-r|--requirement)[\s=]+(\S+)', install_cmd):
+            reqs_path = tool_dir / reqs_file
+            if reqs_path.exists():
+                digest.update(reqs_path.read_bytes())
+        
+        return digest.hexdigest()[:16]
+    
+    def _snapshot_path(self, tool_id: str) -> Path:
+        """Snapshot archive for the tool's current venv signature"""
+        suffix = '.tar.zst' if zstandard else '.tar'
+        return self.venv_cache_dir / f"{tool_id}-{self._venv_signature(tool_id)}{suffix}"
+    
+    def _tool_snapshots(self, tool_id: str) -> List[Path]:
+        """Finished snapshot archives of a tool, for any venv signature"""
+        # Signatures have a fixed length, so tools whose id merely starts
+        # with '<tool_id>-' never match; in-progress .partial files are skipped
+        return [
+            path for path in self.venv_cache_dir.glob(f"{tool_id}-{'?' * 16}.tar*")
+            if not path.name.endswith('.partial')
+        ]
+    
+    def snapshot_venv(self, tool_id: str) -> bool:
+        """Archive a fully installed venv for fast restores in later sessions"""
+        tool_config = self._tools[tool_id]
+        venv_dir = self.workspace_dir / tool_config['dir'] / tool_config['venv_name']
+        snapshot_path = self._snapshot_path(tool_id)
+        
+        if snapshot_path.exists():
+            return True
+        
+        partial_path = snapshot_path.with_name(snapshot_path.name + '.partial')
+        # Record where the venv lived so restores elsewhere can relocate it,
+        # and which interpreter it needs so restores can check it still exists
+        tar_kwargs = {'format': tarfile.PAX_FORMAT, 'pax_headers': {
+            SNAPSHOT_ORIGIN_HEADER: str(venv_dir),
+            SNAPSHOT_BASE_HEADER: os.path.realpath(self._venv_python(venv_dir))
+        }}
+        try:
+            logger.info(f"Snapshotting {tool_config['name']} venv to {snapshot_path}")
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(partial_path, 'wb') as f:
+                if zstandard:
+                    compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+                    with compressor.stream_writer(f) as stream, \
+                            tarfile.open(fileobj=stream, mode='w|', **tar_kwargs) as tar:
+                        tar.add(venv_dir.resolve(), arcname=venv_dir.name)
+                else:
+                    with tarfile.open(fileobj=f, mode='w|', **tar_kwargs) as tar:
+                        tar.add(venv_dir.resolve(), arcname=venv_dir.name)
+            os.replace(partial_path, snapshot_path)
+            
+            # Snapshots for older pins can never be restored again
+            for stale in self._tool_snapshots(tool_id):
+                if stale != snapshot_path:
+                    stale.unlink(missing_ok=True)
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Failed to snapshot venv for {tool_config['name']}: {e}")
+            partial_path.unlink(missing_ok=True)
+            return False
+    
+    def restore_venv(self, tool_id: str) -> bool:
+        """Restore a tool's venv from a matching snapshot, if there is one"""
+        tool_config = self._tools[tool_id]
+        tool_dir = self.workspace_dir / tool_config['dir']
+        venv_dir = tool_dir / tool_config['venv_name']
+        snapshot_path = self._snapshot_path(tool_id)
+        
+        if not snapshot_path.exists():
+            return False
+        
+        # Archives are written by snapshot_venv, so links are trusted
+        extract_kwargs = {'filter': 'fully_trusted'} if hasattr(tarfile, 'fully_trusted_filter') else {}
+        missing_base = False
+        
+        def extract(tar: tarfile.TarFile) -> Optional[str]:
+            nonlocal missing_base
+            # The venv links to its base interpreter, which is gone on a fresh
+            # runtime if it lived outside the venv (e.g. a uv-managed Python)
+            base_python = tar.pax_headers.get(SNAPSHOT_BASE_HEADER)
+            if base_python and not os.path.exists(base_python):
+                missing_base = True
+                raise FileNotFoundError(f"base interpreter {base_python} no longer exists")
+            tar.extractall(tool_dir, **extract_kwargs)
+            return tar.pax_headers.get(SNAPSHOT_ORIGIN_HEADER)
+        
+        try:
+            self._prepare_venv_location(tool_id)
+            logger.info(f"Restoring {tool_config['name']} venv from {snapshot_path}")
+            with open(snapshot_path, 'rb') as f:
+                if zstandard:
+                    with zstandard.ZstdDecompressor().stream_reader(f) as stream, \
+                            tarfile.open(fileobj=stream, mode='r|') as tar:
+                        origin = extract(tar)
+                else:
+                    with tarfile.open(fileobj=f, mode='r|') as tar:
+                        origin = extract(tar)
+            if origin and origin != str(venv_dir):
+                self._relocate_venv(venv_dir, origin)
+            # Older snapshots lack the header; check the restored link itself
+            if not self._venv_python(venv_dir).exists():
+                missing_base = True
+                raise FileNotFoundError(f"{self._venv_python(venv_dir)} does not resolve")
+            logger.info(f"✅ Virtual environment restored for {tool_config['name']}")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"Failed to restore venv for {tool_config['name']}: {e}")
+            shutil.rmtree(venv_dir.resolve(), ignore_errors=True)
+            if venv_dir.is_symlink():
+                venv_dir.unlink()
+            if missing_base:
+                # Setup rebuilds the venv; let it be snapshotted afresh
+                snapshot_path.unlink(missing_ok=True)
+            return False
+    
+    @staticmethod
+    def _venv_python(venv_dir: Path) -> Path:
+        """The interpreter inside a venv"""
+        if os.name == 'nt':  # Windows
+            return venv_dir / "Scripts/python.exe"
+        return venv_dir / "bin/python"
+    
+    @staticmethod
+    def _relocate_venv(venv_dir: Path, origin: str):
+        """Rewrite a moved venv's baked-in paths (scripts, activate, pyvenv.cfg)"""
+        old_path, new_path = origin.encode(), str(venv_dir).encode()
+        bin_dir = venv_dir / ('Scripts' if os.name == 'nt' else 'bin')
+        for path in [venv_dir / 'pyvenv.cfg', *bin_dir.iterdir()]:
+            if path.is_symlink() or not path.is_file():
+                continue
+            data = path.read_bytes()
+            # Shebang scripts and activate files are text; skip real binaries
+            if old_path in data and b'\0' not in data[:1024]:
+                path.write_bytes(data.replace(old_path, new_path))
+    
+    def dedup_site_packages(self, tool_ids: List[str]) -> int:
+        """Hard-link byte-identical site-packages files across tool venvs"""
+        candidates = {}
+        for tool_id in tool_ids:
+            tool_config = self._tools[tool_id]
+            venv_dir = self.workspace_dir / tool_config['dir'] / tool_config['venv_name']
+            for site_packages in venv_dir.glob('lib/python*/site-packages'):
+                for root, dirs, files in os.walk(site_packages):
+                    # Bytecode is specific to the interpreter version
+                    dirs[:] = [d for d in dirs if d != '__pycache__']
+                    for name in files:
+                        path = Path(root) / name
+                        if name.endswith('.pyc') or path.is_symlink():
+                            continue
+                        try:
+                            size = path.stat().st_size
+                            key = (size, self._file_fingerprint(path, size))
+                        except OSError:
+                            continue
+                        candidates.setdefault(key, []).append(path)
+        
+        saved = 0
+        for (size, _), paths in candidates.items():
+            if len(paths) < 2 or size == 0:
+                continue
+            source = paths[0]
+            for path in paths[1:]:
+                try:
+                    if os.path.samefile(source, path) or not filecmp.cmp(source, path, shallow=False):
+                        continue
+                    temp_path = path.with_name(path.name + '.dedup')
+                    os.link(source, temp_path)
+                    os.replace(temp_path, path)
+                    saved += size
+                except OSError as e:
+                    logger.debug(f"Could not dedup {path}: {e}")
+        
+        logger.info(f"🔗 Deduplicated site-packages: {saved / (1024**2):.1f} MB hard-linked")
+        return saved
+    
+    @staticmethod
+    def _file_fingerprint(path: Path, size: int) -> bytes:
+        """Cheap content key: blake2b of the first and last 64KB of a file"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            digest.update(f.read(65536))
+            if size > 65536:
+                f.seek(max(65536, size - 65536))
+                digest.update(f.read())
+        return digest.digest()
     
     def apply_centralized_config(self, tool_id: str) -> bool:
         """Apply centralized model configuration"""
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         method = tool_config.get('centralization_method', 'none')
         
         if method == 'none':
@@ -252,7 +1222,7 @@ Place your {category.lower()} files here to make them available to all tools.
     
     def _create_config_file(self, tool_id: str) -> bool:
         """Create configuration file for centralized models"""
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         tool_dir = self.workspace_dir / tool_config['dir']
         
         if 'config_file' not in tool_config or 'config_template' not in tool_config:
@@ -260,23 +1230,17 @@ Place your {category.lower()} files here to make them available to all tools.
             return False
         
         config_path = tool_dir / tool_config['config_file']
-        config_data = tool_config['config_template'].copy()
         
         # Replace model directory placeholders
-        def replace_placeholders(obj):
-            if isinstance(obj, dict):
-                return {k: replace_placeholders(v) for k, v in obj.items()}
-            elif isinstance(obj, str):
-                return obj.format(models_dir=str(self.models_dir))
-            else:
-                return obj
-        
-        config_data = replace_placeholders(config_data)
+        config_data = self._replace_placeholders(tool_config['config_template'])
         
         try:
             if config_path.suffix.lower() in ['.yaml', '.yml']:
                 with open(config_path, 'w') as f:
-                    yaml.dump(config_data, f, default_flow_style=False)
+                    yaml.dump(config_data, f, Dumper=YamlDumper, default_flow_style=False)
+            elif orjson:
+                with open(config_path, 'wb') as f:
+                    f.write(orjson.dumps(config_data, option=orjson.OPT_INDENT_2))
             else:
                 with open(config_path, 'w') as f:
                     json.dump(config_data, f, indent=2)
@@ -288,39 +1252,183 @@ Place your {category.lower()} files here to make them available to all tools.
             logger.error(f"Failed to create config file for {tool_id}: {e}")
             return False
     
-    def setup_tool(self, tool_id: str) -> bool:
+    def _replace_placeholders(self, template: Any) -> Any:
+        """Copy a config template with {models_dir} filled in, without recursion"""
+        models_dir = str(self.models_dir)
+        pending = []
+        
+        def fill(value):
+            if isinstance(value, str):
+                # Most leaves are plain values with nothing to substitute
+                return value.format(models_dir=models_dir) if '{' in value else value
+            if isinstance(value, (dict, list)):
+                value = value.copy()
+                pending.append(value)
+            return value
+        
+        result = fill(template)
+        while pending:
+            container = pending.pop()
+            for key in (container.keys() if isinstance(container, dict) else range(len(container))):
+                container[key] = fill(container[key])
+        return result
+    
+    def _run_setup_step(self, step_func, cancelled: Optional[threading.Event] = None
+                        ) -> Tuple[bool, Optional[int]]:
+        """Run a setup step, returning its result and the last child's exit code"""
+        self._thread_state.returncode = None
+        self._thread_state.cancelled = cancelled
+        if self._is_cancelled():
+            return False, None
+        return step_func(), self._thread_state.returncode
+    
+    def _setup_failed(self, tool_id: str, step_name: str, returncode: Optional[int],
+                      raise_on_error: bool) -> bool:
+        """Report a failed setup step, raising SetupError if requested"""
+        tool_name = self._tools[tool_id]['name']
+        if self._setup_cancelled.is_set():
+            logger.warning(f"🛑 {tool_name} setup cancelled at: {step_name}")
+        else:
+            logger.error(f"❌ {tool_name} setup failed at: {step_name}")
+        if raise_on_error:
+            raise SetupError(tool_id, step_name, returncode)
+        return False
+    
+    def setup_tool(self, tool_id: str, raise_on_error: bool = False) -> bool:
         """Complete setup for a single tool"""
-        if tool_id not in self.config['tools']:
+        if tool_id not in self._tools:
             logger.error(f"Unknown tool: {tool_id}")
             return False
         
-        tool_config = self.config['tools'][tool_id]
+        # Concurrent setups interleave in the shared log, so each tool's
+        # records (from this thread and its helpers) also go to its own file
+        thread_name = f"setup[{tool_id}]"
+        log_handler = logging.FileHandler(self.workspace_dir / 'logs' / f"venv_manager_{tool_id}.log")
+        log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        log_handler.addFilter(lambda record: record.threadName.startswith(thread_name))
+        logger.addHandler(log_handler)
+        previous_name = threading.current_thread().name
+        threading.current_thread().name = thread_name
+        try:
+            return self._setup_tool(tool_id, raise_on_error)
+        finally:
+            # The installed venv now shows up in the free space itself
+            with self._tmpfs_lock:
+                self._tmpfs_reserved.pop(tool_id, None)
+            threading.current_thread().name = previous_name
+            logger.removeHandler(log_handler)
+            log_handler.close()
+    
+    def _setup_tool(self, tool_id: str, raise_on_error: bool) -> bool:
+        """Run the setup stages of a single tool"""
+        tool_config = self._tools[tool_id]
+        venv_dir = self.workspace_dir / tool_config['dir'] / tool_config['venv_name']
         logger.info(f"🚀 Setting up {tool_config['name']}...")
         
-        steps = [
-            ("Clone repository", lambda: self.clone_repository(tool_id)),
-            ("Create virtual environment", lambda: self.create_virtual_environment(tool_id)),
-            ("Install dependencies", lambda: self.install_dependencies(tool_id)),
-            ("Apply centralized config", lambda: self.apply_centralized_config(tool_id))
-        ]
+        # A snapshot can only be matched once the requirements are cloned, so
+        # hold back venv creation while there may be one to restore
+        may_restore = (
+            self.venv_snapshots and not venv_dir.exists()
+            and any(self._tool_snapshots(tool_id))
+        )
+        
+        # Cloning, venv creation and wheel prefetching don't depend on each
+        # other - overlap them
+        cancelled = threading.Event()
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix=threading.current_thread().name) as executor:
+            prepare_steps = {
+                executor.submit(
+                    self._run_setup_step, lambda: self.clone_repository(tool_id), cancelled
+                ): "Clone repository"
+            }
+            if not may_restore:
+                prepare_steps[executor.submit(
+                    self._run_setup_step, lambda: self.create_virtual_environment(tool_id), cancelled
+                )] = "Create virtual environment"
+            if tool_config.get('prefetch_wheels'):
+                prepare_steps[executor.submit(
+                    self._run_setup_step, lambda: self._prefetch_tool_wheels(tool_id), cancelled
+                )] = "Prefetch wheels"
+            logger.info(f"  [{tool_config['name']}] {' + '.join(prepare_steps.values())}...")
+            
+            # Report the first failure right away, then stop the sibling steps
+            # and their git/pip children; leaving the executor waits for them
+            # to wind down, so nothing outlives this setup
+            pending = set(prepare_steps)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    success, returncode = future.result()
+                    if not success:
+                        cancelled.set()
+                        self._terminate_children(cancelled)
+                        return self._setup_failed(tool_id, prepare_steps[future], returncode, raise_on_error)
+        
+        steps = []
+        if not (may_restore and self.restore_venv(tool_id)):
+            if may_restore:
+                steps.append(("Create virtual environment", lambda: self.create_virtual_environment(tool_id)))
+            steps.append(("Install dependencies", lambda: self.install_dependencies(tool_id)))
+        steps.append(("Apply centralized config", lambda: self.apply_centralized_config(tool_id)))
         
         for step_name, step_func in steps:
-            logger.info(f"  {step_name}...")
-            if not step_func():
-                logger.error(f"❌ {tool_config['name']} setup failed at: {step_name}")
-                return False
+            logger.info(f"  [{tool_config['name']}] {step_name}...")
+            success, returncode = self._run_setup_step(step_func)
+            if not success:
+                return self._setup_failed(tool_id, step_name, returncode, raise_on_error)
+        
+        if self.venv_snapshots:
+            self.snapshot_venv(tool_id)
         
         logger.info(f"✅ {tool_config['name']} setup complete!")
         return True
     
-    def setup_all_tools(self) -> Dict[str, bool]:
-        """Setup all tools and return status"""
+    def setup_all_tools(self, fail_fast: bool = False) -> Dict[str, bool]:
+        """Setup all tools and return status
+
+        With fail_fast, the first failure cancels the remaining setups and
+        terminates their in-flight git/pip processes.
+        """
         results = {}
+        tool_ids = list(self._tools)
+        self._setup_cancelled.clear()
+        self._new_venvs.clear()
         
         logger.info("🚀 Starting batch setup of all tools...")
         
-        for tool_id in self.config['tools'].keys():
-            results[tool_id] = self.setup_tool(tool_id)
+        # Each tool has its own directory and venv, so setups are independent
+        # and mostly blocked on git/pip network I/O - run them concurrently
+        with ThreadPoolExecutor(max_workers=max(1, len(tool_ids))) as executor:
+            futures = {
+                executor.submit(self.setup_tool, tool_id, fail_fast): tool_id
+                for tool_id in tool_ids
+            }
+            for future in as_completed(futures):
+                tool_id = futures[future]
+                try:
+                    results[tool_id] = future.result()
+                except SetupError as e:
+                    results[tool_id] = False
+                    if not self._setup_cancelled.is_set():
+                        logger.error(f"🛑 {e} - cancelling remaining setups")
+                        self._setup_cancelled.set()
+                        self._terminate_children()
+                except Exception as e:
+                    logger.error(f"❌ Unexpected error setting up {tool_id}: {e}")
+                    results[tool_id] = False
+        
+        self._setup_cancelled.clear()
+        
+        # Keep results in config order for callers that display them
+        results = {tool_id: results[tool_id] for tool_id in tool_ids}
+        
+        # Tools share many identical packages (numpy, torch libs, ...). Only
+        # venvs created and installed in this batch hold new copies, and
+        # network/FUSE mounts such as Drive can't hard-link at all.
+        installed = [tool_id for tool_id, success in results.items()
+                     if success and tool_id in self._new_venvs]
+        if len(installed) > 1 and not _is_network_fs(self.workspace_dir):
+            self.dedup_site_packages(installed)
         
         # Summary
         success_count = sum(1 for success in results.values() if success)
@@ -333,47 +1441,22 @@ Place your {category.lower()} files here to make them available to all tools.
     def get_launch_command(self, tool_id: str, custom_args: List[str] = None,
                           hardware_profile: str = None) -> List[str]:
         """Generate launch command for specific tool"""
-        tool_config = self.config['tools'][tool_id]
-        tool_dir = self.workspace_dir / tool_config['dir']
-        venv_dir = tool_dir / tool_config['venv_name']
-        
-        if os.name == 'nt':  # Windows
-            python_exe = venv_dir / "Scripts/python.exe"
-        else:  # Unix/Linux
-            python_exe = venv_dir / "bin/python"
-        
-        # Base command
-        cmd = [str(python_exe), tool_config['script']]
-        
-        # Add default arguments
-        cmd.extend(tool_config.get('default_args', []))
-        
-        # Add hardware profile arguments
-        if hardware_profile and hardware_profile in self.config['hardware_profiles']:
-            profile_args = self.config['hardware_profiles'][hardware_profile]['args']
-            cmd.extend(profile_args)
-        
-        # Add centralized model arguments (for CLI method)
-        if tool_config.get('centralization_method') == 'cli_args':
-            central_args = tool_config.get('centralization_args', [])
-            formatted_args = [
-                arg.format(models_dir=str(self.models_dir)) for arg in central_args
-            ]
-            cmd.extend(formatted_args)
+        cmd = self._prebuilt_cmds.get((tool_id, hardware_profile))
+        if cmd is None:  # Unknown hardware profiles add no arguments
+            cmd = self._prebuilt_cmds[(tool_id, None)]
         
         # Add custom arguments
         if custom_args:
-            cmd.extend(custom_args)
-        
-        return cmd
+            return [*cmd, *custom_args]
+        return list(cmd)
     
     def launch_tool(self, tool_id: str, custom_args: List[str] = None,
                    hardware_profile: str = None) -> bool:
         """Launch a tool in its isolated environment"""
-        if tool_id not in self.config['tools']:
+        if tool_id not in self._tools:
             raise ValueError(f"Unknown tool: {tool_id}")
         
-        tool_config = self.config['tools'][tool_id]
+        tool_config = self._tools[tool_id]
         tool_dir = self.workspace_dir / tool_config['dir']
         
         if not tool_dir.exists():
@@ -381,8 +1464,8 @@ Place your {category.lower()} files here to make them available to all tools.
         
         cmd = self.get_launch_command(tool_id, custom_args, hardware_profile)
         
-        # Setup logging
-        log_queue = queue.Queue(maxsize=1000)
+        # Setup logging; keeps only the most recent lines
+        log_queue = deque(maxlen=self.config['workspace_settings'].get('max_log_lines', 1000))
         self.log_queues[tool_id] = log_queue
         
         # Create log file
@@ -398,9 +1481,7 @@ Place your {category.lower()} files here to make them available to all tools.
                 cmd,
                 cwd=str(tool_dir),
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+                stderr=subprocess.STDOUT
             )
             
             # Store process info
@@ -415,12 +1496,7 @@ Place your {category.lower()} files here to make them available to all tools.
             }
             
             # Start output monitoring
-            monitor_thread = threading.Thread(
-                target=self._monitor_process_output,
-                args=(tool_id, process, log_queue, log_file)
-            )
-            monitor_thread.daemon = True
-            monitor_thread.start()
+            self._monitor_process_output(tool_id, process, log_queue, log_file)
             
             return True
             
@@ -429,51 +1505,153 @@ Place your {category.lower()} files here to make them available to all tools.
             return False
     
     def _monitor_process_output(self, tool_id: str, process: subprocess.Popen,
-                               log_queue: queue.Queue, log_file: Path):
-        """Monitor process output and update logs"""
+                               log_queue: deque, log_file: Path):
+        """Register a launched process's output with the shared monitor thread"""
+        stream = {
+            'tool_id': tool_id,
+            'process': process,
+            'log_queue': log_queue,
+            'log_file': open(log_file, 'wb'),
+            'pending': bytearray(),
+            'flush_deadline': None
+        }
+        if os.name == 'nt':
+            # Windows can't select() on pipes - give each one a reader thread
+            threading.Thread(
+                target=self._drain_output, args=(process.stdout.fileno(), stream), daemon=True
+            ).start()
+            return
+        with self._output_lock:
+            self._output_selector.register(process.stdout.fileno(), selectors.EVENT_READ, stream)
+            if self._output_thread is None:
+                self._output_thread = threading.Thread(target=self._output_loop, daemon=True)
+                self._output_thread.start()
+    
+    def _output_loop(self):
+        """Drain output of all launched tools; exits once none are left"""
         try:
-            with open(log_file, 'w', encoding='utf-8') as f:
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        timestamp = datetime.now().strftime('%H:%M:%S')
-                        log_entry = f"[{timestamp}] {line.strip()}"
-                        
-                        # Write to file
-                        f.write(log_entry + '\n')
-                        f.flush()
-                        
-                        # Add to queue (non-blocking)
-                        try:
-                            log_queue.put(log_entry, timeout=0.1)
-                        except queue.Full:
-                            pass  # Skip if queue is full
-                        
-                        # Update status based on output
-                        self._parse_status_from_output(tool_id, line)
+            while True:
+                with self._output_lock:
+                    streams = [key.data for key in self._output_selector.get_map().values()]
+                    if not streams:
+                        self._output_thread = None
+                        return
+                
+                # Every tool's pipe depends on this thread; an error (e.g. a
+                # full disk on flush) must not stop it from draining them
+                try:
+                    self._pump_output(streams)
+                except Exception as e:
+                    logger.error(f"Error monitoring tool output: {e}")
+                    time.sleep(0.5)
+        finally:
+            with self._output_lock:
+                if self._output_thread is threading.current_thread():
+                    self._output_thread = None
+    
+    def _pump_output(self, streams: List[Dict[str, Any]]):
+        """One pass of the monitor loop: read ready pipes, flush due log files"""
+        # Wake for new output, the next due log flush, or new registrations
+        deadlines = [s['flush_deadline'] for s in streams if s['flush_deadline'] is not None]
+        timeout = min([0.5] + [max(0.0, d - time.monotonic()) for d in deadlines])
+        for key, _ in self._output_selector.select(timeout):
+            self._read_output(key.fd, key.data)
+        
+        now = time.monotonic()
+        for stream in streams:
+            if stream['flush_deadline'] is not None and now >= stream['flush_deadline']:
+                stream['flush_deadline'] = None
+                stream['log_file'].flush()
+    
+    def _drain_output(self, fd: int, stream: Dict[str, Any]):
+        """Blocking-read one tool's output until it exits (Windows fallback)"""
+        while self._read_output(fd, stream):
+            # Nothing wakes this thread for a deferred flush, so flush now
+            if stream['flush_deadline'] is not None:
+                stream['log_file'].flush()
+                stream['flush_deadline'] = None
+    
+    def _read_output(self, fd: int, stream: Dict[str, Any]) -> bool:
+        """Take up to 64KB from a tool's pipe and log its complete lines
+
+        Returns False once the pipe is closed and the stream cleaned up.
+        """
+        tool_id = stream['tool_id']
+        try:
+            chunk = os.read(fd, 65536)
+            if chunk:
+                stream['pending'] += chunk
+                lines = self._take_complete_lines(stream['pending'])
+                if lines:
+                    self._record_output_lines(tool_id, lines, stream['log_queue'], stream['log_file'])
+                    if stream['flush_deadline'] is None:
+                        stream['flush_deadline'] = time.monotonic() + LOG_FLUSH_INTERVAL
+                return True
+            if stream['pending']:
+                self._record_output_lines(tool_id, [bytes(stream['pending'])],
+                                          stream['log_queue'], stream['log_file'])
         
         except Exception as e:
             logger.error(f"Error monitoring output for {tool_id}: {e}")
         
-        finally:
-            # Process finished
-            if tool_id in self.processes:
-                self.processes[tool_id]['status'] = 'stopped'
+        # Process finished (or its output can no longer be read)
+        if os.name != 'nt':
+            with self._output_lock:
+                self._output_selector.unregister(fd)
+        stream['log_file'].close()
+        stream['process'].stdout.close()
+        if self.processes.get(tool_id, {}).get('process') is stream['process']:
+            self.processes[tool_id]['status'] = 'stopped'
+        return False
+    
+    @staticmethod
+    def _take_complete_lines(pending: bytearray) -> List[bytes]:
+        """Remove and return the complete lines (CR or LF terminated) in pending"""
+        # A trailing CR may be the first half of a CRLF split across reads
+        search_end = len(pending) - 1 if pending.endswith(b'\r') else len(pending)
+        end = max(pending.rfind(b'\n', 0, search_end), pending.rfind(b'\r', 0, search_end))
+        if end < 0:
+            return []
+        complete = bytes(pending[:end])
+        del pending[:end + 1]
+        return complete.replace(b'\r\n', b'\n').replace(b'\r', b'\n').split(b'\n')
+    
+    def _record_output_lines(self, tool_id: str, lines: List[bytes],
+                             log_queue: deque, log_file):
+        """Log a batch of raw output lines to file, queue and status parser"""
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        entries = []
+        for raw_line in lines:
+            line = raw_line.decode('utf-8', errors='replace')
+            log_entry = f"[{timestamp}] {line.strip()}"
+            entries.append(log_entry + '\n')
+            
+            # Oldest lines drop off once the buffer is full
+            log_queue.append(log_entry)
+            
+            # Update status based on output
+            self._parse_status_from_output(tool_id, line)
+        
+        log_file.write(''.join(entries).encode('utf-8'))
     
     def _parse_status_from_output(self, tool_id: str, line: str):
         """Parse status from process output"""
+        # Called for every output line: plain substring checks over constant
+        # tuples beat both any() generators and a compiled regex alternation
         line_lower = line.lower()
+        status = None
+        for phrase in _RUNNING_PHRASES:
+            if phrase in line_lower:
+                status = 'running'
+                break
+        else:
+            for phrase in _ERROR_PHRASES:
+                if phrase in line_lower:
+                    status = 'error'
+                    break
         
-        if any(phrase in line_lower for phrase in [
-            'running on', 'server started', 'listening on', 'model loaded'
-        ]):
-            if tool_id in self.processes:
-                self.processes[tool_id]['status'] = 'running'
-        
-        elif any(phrase in line_lower for phrase in [
-            'error', 'failed', 'exception', 'traceback'
-        ]):
-            if tool_id in self.processes:
-                self.processes[tool_id]['status'] = 'error'
+        if status and tool_id in self.processes:
+            self.processes[tool_id]['status'] = status
     
     def stop_tool(self, tool_id: str) -> bool:
         """Stop a running tool"""
@@ -535,42 +1713,70 @@ Place your {category.lower()} files here to make them available to all tools.
         if tool_id not in self.log_queues:
             return []
         
+        # Read the tail without draining, so the buffer can be re-read
         log_queue = self.log_queues[tool_id]
-        logs = []
-        
-        while not log_queue.empty() and len(logs) < max_lines:
-            try:
-                log_entry = log_queue.get_nowait()
-                logs.append(log_entry)
-            except queue.Empty:
-                break
-        
-        return logs[-max_lines:]
+        length = len(log_queue)
+        return list(itertools.islice(log_queue, max(0, length - max_lines), length))
+    
+    def _scan_model_category(self, category: str) -> Tuple[int, int]:
+        """Count the model files in a category directory and sum their sizes"""
+        extensions = self._model_extensions[category]
+        count = total_size = 0
+        # DirEntry type/stat info comes with the directory listing, so plain
+        # files cost no extra syscalls (symlinked models are still followed)
+        try:
+            entries = os.scandir(self.models_dir / category)
+        except OSError:  # Unreadable, or removed since it was stat()ed
+            return 0, 0
+        with entries:
+            for entry in entries:
+                dot = entry.name.rfind('.')
+                if dot < 0 or entry.name[dot:].lower() not in extensions:
+                    continue
+                try:
+                    if entry.is_file():
+                        total_size += entry.stat().st_size
+                        count += 1
+                except OSError:
+                    pass
+        return count, total_size
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status"""
-        total_tools = len(self.config['tools'])
+        total_tools = len(self._tools)
         running_tools = sum(1 for tool_id in self.processes.keys()
                            if self.get_process_status(tool_id)['status'] == 'running')
         
-        # Calculate model storage info
-        total_size_gb = 0
+        # Calculate model storage info; a category is only rescanned when
+        # files were added, removed or renamed in it since the last call
+        total_size = 0
         model_counts = {}
         
-        for category in self.config['model_categories'].keys():
-            category_dir = self.models_dir / category
-            if category_dir.exists():
-                files = list(category_dir.glob("*"))
-                model_files = [f for f in files if f.is_file() and 
-                             f.suffix in self.config['model_categories'][category]['extensions']]
-                model_counts[category] = len(model_files)
-                
-                # Estimate total size
-                for f in model_files:
-                    try:
-                        total_size_gb += f.stat().st_size / (1024**3)
-                    except OSError:
-                        pass
+        changed = {}
+        for category in self._category_names:
+            try:
+                mtime_ns = os.stat(self.models_dir / category).st_mtime_ns
+            except OSError:
+                continue
+            cached = self._model_scan_cache.get(category)
+            if cached is None or cached[0] != mtime_ns:
+                changed[category] = mtime_ns
+            model_counts[category] = None
+        
+        # stat() releases the GIL, so categories scan in parallel
+        if len(changed) > 1:
+            with ThreadPoolExecutor(max_workers=len(changed)) as executor:
+                scans = dict(zip(changed, executor.map(self._scan_model_category, changed)))
+        else:
+            scans = {category: self._scan_model_category(category) for category in changed}
+        for category, mtime_ns in changed.items():
+            self._model_scan_cache[category] = (mtime_ns, *scans[category])
+        
+        for category in model_counts:
+            _, model_counts[category], size = self._model_scan_cache[category]
+            total_size += size
+        
+        total_size_gb = total_size / (1024**3)
         
         return {
             'total_tools': total_tools,
@@ -590,6 +1796,7 @@ def main():
     parser.add_argument("--config", default="config.json", help="Configuration file")
     parser.add_argument("--setup-all", action="store_true", help="Setup all tools")
     parser.add_argument("--setup", help="Setup specific tool")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop --setup-all at the first failure")
     parser.add_argument("--launch", help="Launch specific tool")
     parser.add_argument("--stop", help="Stop specific tool")
     parser.add_argument("--status", action="store_true", help="Show system status")
@@ -609,12 +1816,14 @@ def main():
                 print(f"     {config['description']}")
         
         elif args.setup_all:
-            results = manager.setup_all_tools()
+            results = manager.setup_all_tools(fail_fast=args.fail_fast)
             print("\n📊 Setup Results:")
             for tool_id, success in results.items():
                 status = "✅" if success else "❌"
                 tool_name = manager.config['tools'][tool_id]['name']
                 print(f"  {status} {tool_name}")
+            if not all(results.values()):
+                sys.exit(1)
         
         elif args.setup:
             success = manager.setup_tool(args.setup)
@@ -623,6 +1832,7 @@ def main():
                 print(f"✅ {tool_name} setup complete")
             else:
                 print(f"❌ {tool_name} setup failed")
+                sys.exit(1)
         
         elif args.launch:
             success = manager.launch_tool(args.launch, args.args, args.profile)